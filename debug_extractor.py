@@ -33,8 +33,8 @@ try:
     
     print("\n✓ SUCCESS! Extraction worked.")
     print(f"\nExtracted metadata:")
-    import json
-    print(json.dumps(result, indent=2))
+    import orjson
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
     
 except Exception as e:
     print(f"\n✗ FAILED: {e}")
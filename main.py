@@ -17,17 +17,46 @@ This demonstrates the "chaining" concept - multiple AI calls in sequence,
 each building on the previous one's output.
 """
 
+import io
 import sys
+import json
+import time
+import asyncio
+import hashlib
 from pathlib import Path
 from datetime import datetime
 
+import config
+
 # Import pipeline components
 from pipeline.classifier import classifier
 from pipeline.extractor import extractor
 from pipeline.generator import generator
+from pipeline.fused import fused_processor
+from pipeline.extract_generate import extract_and_generate
+from pipeline.batch_io import BatchIO
 from pipeline.router import router
 from pipeline.logger import pipeline_logger
 
+# Buffered progress output. print() acquires the stdout lock and issues a
+# write() syscall per call, which serializes concurrent workers - so all
+# pipeline progress goes through this buffered stream instead, gated by
+# config.VERBOSE and flushed only at stage/batch boundaries.
+_stdout_buffer = io.TextIOWrapper(
+    io.BufferedWriter(sys.stdout.buffer, buffer_size=8192),
+    line_buffering=False
+)
+
+def _say(msg):
+    """Write one line of progress output (no-op unless config.VERBOSE)."""
+    if config.VERBOSE:
+        _stdout_buffer.write(msg + "\n")
+
+def _flush_progress():
+    """Flush buffered progress output (called at stage/batch boundaries)."""
+    if config.VERBOSE:
+        _stdout_buffer.flush()
+
 class ContentPipeline:
     """
     Main pipeline orchestrator that chains all stages together.
@@ -38,6 +67,7 @@ class ContentPipeline:
         self.classifier = classifier
         self.extractor = extractor
         self.generator = generator
+        self.fused = fused_processor
         self.router = router
         self.logger = pipeline_logger
     
@@ -62,44 +92,55 @@ class ContentPipeline:
         
         # Log start of processing
         self.logger.log_start(input_id, source)
-        
+
+        # Fused mode: one Claude call does all three AI stages at once
+        if config.FUSED_MODE:
+            return self._process_fused(content, input_id)
+
         try:
             # STAGE 1: CLASSIFY
-            print(f"\n{'='*60}")
-            print(f"Processing: {input_id}")
-            print(f"{'='*60}")
-            print("\n[Stage 1/4] Classifying content...")
+            _say(f"\n{'='*60}")
+            _say(f"Processing: {input_id}")
+            _say(f"{'='*60}")
+            _say("\n[Stage 1/4] Classifying content...")
             
             classification = self.classifier.classify(content, input_id)
             content_type = classification["content_type"]
             
-            print(f"✓ Content classified as: {content_type}")
-            print(f"  Confidence: {classification['confidence']}")
-            print(f"  Reasoning: {classification['reasoning']}")
-            
-            # STAGE 2: EXTRACT METADATA
-            print("\n[Stage 2/4] Extracting metadata...")
+            _say(f"✓ Content classified as: {content_type}")
+            _say(f"  Confidence: {classification['confidence']}")
+            _say(f"  Reasoning: {classification['reasoning']}")
             
-            metadata = self.extractor.extract(content, content_type, input_id)
-            
-            print(f"✓ Metadata extracted:")
-            print(f"  Teams: {', '.join(metadata.get('teams', [])) or 'None'}")
-            print(f"  Players: {', '.join(metadata.get('players', [])[:3]) or 'None'}")
-            print(f"  Competition: {metadata.get('competition', 'N/A')}")
-            print(f"  Sentiment: {metadata.get('sentiment', 'N/A')}")
-            
-            # STAGE 3: GENERATE HEADLINES
-            print("\n[Stage 3/4] Generating headlines...")
-            
-            headlines = self.generator.generate(content, metadata, content_type, input_id)
-            
-            print(f"✓ Headlines generated:")
-            print(f"  Neutral: {headlines['neutral']}")
-            print(f"  Fan-oriented: {headlines['fan_oriented']}")
-            print(f"  Casual viewer: {headlines['casual_viewer']}")
+            # STAGES 2+3: EXTRACT METADATA, GENERATE HEADLINES
+            # Optionally fused into one call once the content type is known
+            if config.FUSE_STAGES_23:
+                _say("\n[Stages 2+3/4] Extracting metadata and generating headlines in one call...")
+
+                metadata, headlines = extract_and_generate(content, content_type, input_id)
+            else:
+                # STAGE 2: EXTRACT METADATA
+                _say("\n[Stage 2/4] Extracting metadata...")
+
+                metadata = self.extractor.extract(content, content_type, input_id)
+
+                # STAGE 3: GENERATE HEADLINES
+                _say("\n[Stage 3/4] Generating headlines...")
+
+                headlines = self.generator.generate(content, metadata, content_type, input_id)
+
+            _say(f"✓ Metadata extracted:")
+            _say(f"  Teams: {', '.join(metadata.get('teams', [])) or 'None'}")
+            _say(f"  Players: {', '.join(metadata.get('players', [])[:3]) or 'None'}")
+            _say(f"  Competition: {metadata.get('competition', 'N/A')}")
+            _say(f"  Sentiment: {metadata.get('sentiment', 'N/A')}")
+
+            _say(f"✓ Headlines generated:")
+            _say(f"  Neutral: {headlines['neutral']}")
+            _say(f"  Fan-oriented: {headlines['fan_oriented']}")
+            _say(f"  Casual viewer: {headlines['casual_viewer']}")
             
             # STAGE 4: ROUTE TO DESTINATION
-            print("\n[Stage 4/4] Routing to output...")
+            _say("\n[Stage 4/4] Routing to output...")
             
             output_path = self.router.route(
                 input_id=input_id,
@@ -110,14 +151,15 @@ class ContentPipeline:
                 headlines=headlines
             )
             
-            print(f"✓ Content routed to: {output_path}")
+            _say(f"✓ Content routed to: {output_path}")
             
             # Log completion
             self.logger.log_complete(input_id, output_path)
             
-            print(f"\n{'='*60}")
-            print(f"✓ Pipeline completed successfully for {input_id}")
-            print(f"{'='*60}\n")
+            _say(f"\n{'='*60}")
+            _say(f"✓ Pipeline completed successfully for {input_id}")
+            _say(f"{'='*60}\n")
+            _flush_progress()
             
             # Return all results
             return {
@@ -131,8 +173,9 @@ class ContentPipeline:
             
         except Exception as e:
             # If any stage fails, log and return None
-            print(f"\n✗ Pipeline failed for {input_id}")
-            print(f"  Error: {str(e)}\n")
+            _say(f"\n✗ Pipeline failed for {input_id}")
+            _say(f"  Error: {str(e)}\n")
+            _flush_progress()
             
             return {
                 "input_id": input_id,
@@ -140,52 +183,600 @@ class ContentPipeline:
                 "error": str(e)
             }
     
-    def process_batch(self, contents):
+    def _process_fused(self, content, input_id):
         """
-        Process multiple pieces of content in sequence.
-        
+        Process a single item using the fused one-call processor.
+
+        Routing and logging behave exactly like the staged path - only the
+        three AI calls are collapsed into one.
+
+        Returns:
+            dict: Same result structure as process()
+        """
+        try:
+            _say(f"\n{'='*60}")
+            _say(f"Processing (fused): {input_id}")
+            _say(f"{'='*60}")
+            _say("\n[Stage 1/2] Classifying, extracting and generating in one call...")
+
+            fused = self.fused.run(content, input_id)
+            classification = fused["classification"]
+            metadata = fused["metadata"]
+            headlines = fused["headlines"]
+            content_type = classification["content_type"]
+
+            _say(f"✓ Content classified as: {content_type}")
+            _say(f"  Neutral headline: {headlines['neutral']}")
+
+            _say("\n[Stage 2/2] Routing to output...")
+
+            output_path = self.router.route(
+                input_id=input_id,
+                content_type=content_type,
+                original_content=content,
+                classification=classification,
+                metadata=metadata,
+                headlines=headlines
+            )
+
+            _say(f"✓ Content routed to: {output_path}")
+
+            self.logger.log_complete(input_id, output_path)
+
+            return {
+                "input_id": input_id,
+                "status": "success",
+                "classification": classification,
+                "metadata": metadata,
+                "headlines": headlines,
+                "output_path": output_path
+            }
+
+        except Exception as e:
+            _say(f"\n✗ Pipeline failed for {input_id}")
+            _say(f"  Error: {str(e)}\n")
+            _flush_progress()
+
+            return {
+                "input_id": input_id,
+                "status": "failed",
+                "error": str(e)
+            }
+
+    async def aprocess(self, content, input_id=None, source=None):
+        """
+        Async version of process() for concurrent batch processing.
+
+        The three AI stages still run sequentially for a single item (each
+        depends on the previous one's output), but because they await the
+        AsyncAnthropic client, many items can be in flight at once - the
+        pipeline is network-bound on API latency, not CPU.
+
+        Per-stage progress printing is kept to a minimum here since output
+        from concurrent items would interleave.
+
+        Args:
+            content: Raw text content to process
+            input_id: Optional unique identifier (auto-generated if not provided)
+            source: Optional source description for logging
+
+        Returns:
+            dict: Same result structure as process()
+        """
+
+        # Generate input_id if not provided
+        if not input_id:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            input_id = f"content_{timestamp}"
+
+        # Log start of processing
+        self.logger.log_start(input_id, source)
+
+        try:
+            if config.SPECULATE:
+                # STAGES 1+2 overlapped: bet on the dominant content type
+                # and start its extraction before classification confirms
+                classification, metadata = await self._aclassify_speculative(content, input_id)
+                content_type = classification["content_type"]
+            else:
+                # STAGE 1: CLASSIFY
+                classification = await self.classifier.aclassify(content, input_id)
+                content_type = classification["content_type"]
+
+                # STAGE 2: EXTRACT METADATA
+                metadata = await self.extractor.aextract(content, content_type, input_id)
+
+            # STAGE 3: GENERATE HEADLINES
+            headlines = await self.generator.agenerate(content, metadata, content_type, input_id)
+
+            # STAGE 4: ROUTE TO DESTINATION (local file I/O, no API call)
+            output_path = self.router.route(
+                input_id=input_id,
+                content_type=content_type,
+                original_content=content,
+                classification=classification,
+                metadata=metadata,
+                headlines=headlines
+            )
+
+            # Log completion
+            self.logger.log_complete(input_id, output_path)
+
+            _say(f"✓ {input_id}: {content_type} -> {output_path}")
+
+            return {
+                "input_id": input_id,
+                "status": "success",
+                "classification": classification,
+                "metadata": metadata,
+                "headlines": headlines,
+                "output_path": output_path
+            }
+
+        except Exception as e:
+            _say(f"✗ {input_id} failed: {str(e)}")
+
+            return {
+                "input_id": input_id,
+                "status": "failed",
+                "error": str(e)
+            }
+
+    # The content type speculation bets on (see config.SPECULATE). Match
+    # reports dominate typical sports feeds, so their extraction prompt is
+    # the one worth warming up ahead of the classifier's verdict.
+    SPECULATED_TYPE = "match_report"
+
+    async def _aclassify_speculative(self, content, input_id):
+        """
+        Run stage 1 with a speculative stage 2 already in flight.
+
+        Classification and a match_report extraction are started together.
+        If the classifier confirms the guess, the extraction result (often
+        already finished) is awaited directly - stage 2's latency hid
+        behind stage 1's. On any other verdict the speculative call is
+        cancelled and extraction reruns with the right prompt, costing one
+        wasted partial API call but no extra wall time versus the
+        sequential path.
+
+        Returns:
+            tuple: (classification dict, metadata dict)
+        """
+        classify_task = asyncio.create_task(self.classifier.aclassify(content, input_id))
+        speculative = asyncio.create_task(
+            self.extractor.aextract(content, self.SPECULATED_TYPE, input_id)
+        )
+
+        try:
+            classification = await classify_task
+        except Exception:
+            speculative.cancel()
+            raise
+
+        if classification["content_type"] == self.SPECULATED_TYPE:
+            metadata = await speculative
+        else:
+            # Wrong guess: abandon the in-flight extraction (reaping its
+            # cancellation so asyncio doesn't warn) and redo it properly
+            speculative.cancel()
+            try:
+                await speculative
+            except (asyncio.CancelledError, Exception):
+                pass
+            metadata = await self.extractor.aextract(
+                content, classification["content_type"], input_id
+            )
+
+        return classification, metadata
+
+    async def process_batch_async(self, contents, max_concurrency=None):
+        """
+        Process multiple pieces of content concurrently, in two waves.
+
+        Wave 1 classifies ALL items concurrently (classification is
+        embarrassingly parallel). Items are then bucketed by content_type -
+        every item in a bucket shares the same cached extraction prompt
+        prefix, so grouping them keeps the prompt cache hot. Wave 2 runs
+        stages 2+3 for each bucket, collecting items as they complete so
+        fast items finish early instead of waiting on stragglers.
+
+        Both waves are bounded by a semaphore so total in-flight API calls
+        stay under the provider's rate limits.
+
         Args:
             contents: List of dicts with keys 'content', 'input_id', 'source'
-            
+            max_concurrency: Max API calls in flight at once (defaults to config.MAX_CONCURRENCY)
+
         Returns:
-            list: Results for each item processed
+            list: Results for each item, in the same order as contents
         """
-        results = []
-        
-        print(f"\n{'#'*60}")
-        print(f"BATCH PROCESSING: {len(contents)} items")
-        print(f"{'#'*60}\n")
-        
+        semaphore = asyncio.Semaphore(max_concurrency or config.MAX_CONCURRENCY)
+
+        # Assign input_ids up front so results can be re-ordered at the end
+        items = []
         for item in contents:
-            result = self.process(
-                content=item.get("content"),
-                input_id=item.get("input_id"),
-                source=item.get("source")
+            input_id = item.get("input_id")
+            if not input_id:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                input_id = f"content_{timestamp}"
+            items.append({
+                "input_id": input_id,
+                "content": item.get("content"),
+                "source": item.get("source")
+            })
+            self.logger.log_start(input_id, item.get("source"))
+
+        results = {}
+
+        # WAVE 1: classify everything concurrently
+        async def classify_with_limit(item):
+            async with semaphore:
+                return await self.classifier.aclassify(item["content"], item["input_id"])
+
+        classifications = await asyncio.gather(
+            *[classify_with_limit(item) for item in items],
+            return_exceptions=True
+        )
+
+        # Bucket successfully classified items by content_type
+        buckets = {}
+        for item, classification in zip(items, classifications):
+            if isinstance(classification, Exception):
+                _say(f"✗ {item['input_id']} failed: {str(classification)}")
+                results[item["input_id"]] = {
+                    "input_id": item["input_id"],
+                    "status": "failed",
+                    "error": str(classification)
+                }
+                continue
+            item["classification"] = classification
+            buckets.setdefault(classification["content_type"], []).append(item)
+
+        # WAVE 2: finish stages 2+3 per bucket, reaping results as they land
+        async def finish_with_limit(item):
+            async with semaphore:
+                return await self._afinish_item(item)
+
+        pending = [
+            finish_with_limit(item)
+            for bucket_items in buckets.values()
+            for item in bucket_items
+        ]
+        for completed in asyncio.as_completed(pending):
+            result = await completed
+            results[result["input_id"]] = result
+
+        return [results[item["input_id"]] for item in items]
+
+    async def _afinish_item(self, item):
+        """
+        Run stages 2-4 for one already-classified item.
+
+        Returns:
+            dict: Same result structure as process()
+        """
+        input_id = item["input_id"]
+        classification = item["classification"]
+        content_type = classification["content_type"]
+
+        try:
+            metadata = await self.extractor.aextract(item["content"], content_type, input_id)
+            headlines = await self.generator.agenerate(item["content"], metadata, content_type, input_id)
+
+            output_path = self.router.route(
+                input_id=input_id,
+                content_type=content_type,
+                original_content=item["content"],
+                classification=classification,
+                metadata=metadata,
+                headlines=headlines
             )
-            results.append(result)
-        
+
+            self.logger.log_complete(input_id, output_path)
+
+            _say(f"✓ {input_id}: {content_type} -> {output_path}")
+
+            return {
+                "input_id": input_id,
+                "status": "success",
+                "classification": classification,
+                "metadata": metadata,
+                "headlines": headlines,
+                "output_path": output_path
+            }
+
+        except Exception as e:
+            _say(f"✗ {input_id} failed: {str(e)}")
+
+            return {
+                "input_id": input_id,
+                "status": "failed",
+                "error": str(e)
+            }
+
+    def process_batch(self, contents):
+        """
+        Process multiple pieces of content concurrently.
+
+        Sync entry point that drives process_batch_async - wall time is
+        roughly one item's latency rather than the sum of all items'.
+
+        Args:
+            contents: List of dicts with keys 'content', 'input_id', 'source'
+
+        Returns:
+            list: Results for each item processed
+        """
+        _say(f"\n{'#'*60}")
+        _say(f"BATCH PROCESSING: {len(contents)} items")
+        _say(f"{'#'*60}\n")
+
+        results = asyncio.run(self.process_batch_async(contents))
+
         # Print summary
         successful = sum(1 for r in results if r.get("status") == "success")
         failed = len(results) - successful
         
-        print(f"\n{'#'*60}")
-        print(f"BATCH SUMMARY")
-        print(f"{'#'*60}")
-        print(f"Total processed: {len(results)}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
+        _say(f"\n{'#'*60}")
+        _say(f"BATCH SUMMARY")
+        _say(f"{'#'*60}")
+        _say(f"Total processed: {len(results)}")
+        _say(f"Successful: {successful}")
+        _say(f"Failed: {failed}")
         
         # Show routing statistics
         routing_stats = self.router.get_routing_stats()
-        print(f"\nRouting statistics:")
+        _say(f"\nRouting statistics:")
         for content_type, count in routing_stats.items():
             if count > 0:
-                print(f"  {content_type}: {count} items")
+                _say(f"  {content_type}: {count} items")
         
-        print(f"{'#'*60}\n")
+        _say(f"{'#'*60}\n")
+        _flush_progress()
         
         return results
 
+    def process_batch_offline(self, contents, job_id=None, poll_interval=30):
+        """
+        Process a batch through Anthropic's Message Batches API.
+
+        Instead of 3N individual HTTPS calls, this submits three batch jobs
+        (one per stage - each stage needs the previous stage's output) and
+        polls each until it finishes. Batched requests run at ~50% of the
+        normal per-token cost, making this the right transport for offline
+        backfills where latency doesn't matter but throughput and cost do.
+
+        The batch ID for each stage is persisted to a state file under the
+        logs directory, so if the process crashes mid-job, re-running with
+        the same inputs resumes from the already-submitted stage instead of
+        re-submitting (and re-paying for) it.
+
+        Args:
+            contents: List of dicts with keys 'content', 'input_id', 'source'
+            job_id: Optional stable identifier for resume (derived from the
+                    input_ids if not provided)
+            poll_interval: Seconds between batch status polls
+
+        Returns:
+            list: Results for each item, in the same order as contents
+        """
+
+        # Assign input_ids up front - they double as batch custom_ids
+        items = []
+        for item in contents:
+            input_id = item.get("input_id")
+            if not input_id:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                input_id = f"content_{timestamp}"
+            items.append({
+                "input_id": input_id,
+                "content": item.get("content"),
+                "source": item.get("source")
+            })
+
+        # Derive a stable job_id from the input_ids so a crashed run can
+        # find its own state file when re-run with the same inputs
+        if not job_id:
+            digest = hashlib.sha256("|".join(i["input_id"] for i in items).encode()).hexdigest()
+            job_id = f"batch_{digest[:12]}"
+
+        state_path = Path(config.LOG_DIR) / f"{job_id}_state.json"
+        state = json.loads(state_path.read_text()) if state_path.exists() else {}
+
+        for item in items:
+            self.logger.log_start(item["input_id"], item["source"])
+
+        _say(f"\n{'#'*60}")
+        _say(f"OFFLINE BATCH PROCESSING: {len(items)} items (job: {job_id})")
+        _say(f"{'#'*60}\n")
+
+        # Track per-item state; items that fail a stage skip later stages
+        results = {i["input_id"]: {"input_id": i["input_id"], "status": "success"} for i in items}
+
+        def fail(input_id, error):
+            results[input_id] = {"input_id": input_id, "status": "failed", "error": str(error)}
+
+        def alive(stage_items):
+            return [i for i in stage_items if results[i["input_id"]]["status"] == "success"]
+
+        # STAGE 1: CLASSIFY (one batch for all items)
+        _say("[Stage 1/3] Submitting classification batch...")
+        requests = [
+            self._batch_request(
+                i["input_id"],
+                self.classifier._build_user_message(i["content"]),
+                config.CLASSIFIER_MODEL, config.CLASSIFIER_MAX_TOKENS,
+                system=self.classifier._system_blocks()
+            )
+            for i in items
+        ]
+        responses = self._run_message_batch("classify", requests, state, state_path, poll_interval)
+
+        for item in items:
+            ok, payload = responses[item["input_id"]]
+            if not ok:
+                fail(item["input_id"], payload)
+                continue
+            try:
+                classification = self.classifier._parse_response(payload, item["input_id"])
+                results[item["input_id"]]["classification"] = classification
+                item["content_type"] = classification["content_type"]
+            except Exception as e:
+                fail(item["input_id"], e)
+
+        # STAGE 2: EXTRACT (batch over items that classified successfully)
+        stage2_items = alive(items)
+        _say(f"[Stage 2/3] Submitting extraction batch ({len(stage2_items)} items)...")
+        requests = [
+            self._batch_request(
+                i["input_id"],
+                self.extractor._build_user_message(i["content"]),
+                config.EXTRACTOR_MODEL, config.EXTRACTOR_MAX_TOKENS,
+                system=self.extractor._system_blocks(i["content_type"])
+            )
+            for i in stage2_items
+        ]
+        responses = self._run_message_batch("extract", requests, state, state_path, poll_interval)
+
+        for item in stage2_items:
+            ok, payload = responses[item["input_id"]]
+            if not ok:
+                fail(item["input_id"], payload)
+                continue
+            try:
+                metadata = self.extractor._parse_response(payload, item["input_id"])
+                results[item["input_id"]]["metadata"] = metadata
+                item["metadata"] = metadata
+            except Exception as e:
+                fail(item["input_id"], e)
+
+        # STAGE 3: GENERATE (batch over items that extracted successfully)
+        stage3_items = alive(items)
+        _say(f"[Stage 3/3] Submitting generation batch ({len(stage3_items)} items)...")
+        requests = [
+            self._batch_request(
+                i["input_id"],
+                self.generator._build_user_message(i["content"], i["metadata"], i["content_type"]),
+                config.GENERATOR_MODEL, config.GENERATOR_MAX_TOKENS,
+                system=self.generator._system_blocks(),
+                temperature=0.7  # Matches HeadlineGenerator's creative temperature
+            )
+            for i in stage3_items
+        ]
+        responses = self._run_message_batch("generate", requests, state, state_path, poll_interval)
+
+        for item in stage3_items:
+            ok, payload = responses[item["input_id"]]
+            if not ok:
+                fail(item["input_id"], payload)
+                continue
+            try:
+                headlines = self.generator._parse_response(payload, item["input_id"])
+                results[item["input_id"]]["headlines"] = headlines
+            except Exception as e:
+                fail(item["input_id"], e)
+
+        # ROUTE completed items (local file I/O, no API involvement).
+        # Deferred through BatchIO so writes are grouped by destination
+        # directory and completion logs run as one batch afterwards.
+        batch_io = BatchIO()
+
+        def defer_route(item, result):
+            def do_route():
+                try:
+                    output_path = self.router.route(
+                        input_id=item["input_id"],
+                        content_type=item["content_type"],
+                        original_content=item["content"],
+                        classification=result["classification"],
+                        metadata=result["metadata"],
+                        headlines=result["headlines"]
+                    )
+                    result["output_path"] = output_path
+                    batch_io.defer(
+                        BatchIO.LEVEL_COMPLETE,
+                        lambda: self.logger.log_complete(item["input_id"], output_path)
+                    )
+                except Exception as e:
+                    fail(item["input_id"], e)
+            batch_io.defer(BatchIO.LEVEL_ROUTE, do_route, group=item["content_type"])
+
+        for item in alive(items):
+            defer_route(item, results[item["input_id"]])
+        batch_io.drain()
+
+        # Job finished - remove the resume state file
+        if state_path.exists():
+            state_path.unlink()
+
+        successful = sum(1 for r in results.values() if r["status"] == "success")
+        _say(f"\nOffline batch complete: {successful}/{len(items)} successful\n")
+        _flush_progress()
+
+        return [results[i["input_id"]] for i in items]
+
+    def _batch_request(self, custom_id, user_message, model, max_tokens, system=None, temperature=None):
+        """Build a single Message Batches request entry."""
+        params = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": config.TEMPERATURE if temperature is None else temperature,
+            "messages": [{
+                "role": "user",
+                "content": user_message
+            }]
+        }
+        if system:
+            params["system"] = system
+        return {
+            "custom_id": custom_id,
+            "params": params
+        }
+
+    def _run_message_batch(self, stage_key, requests, state, state_path, poll_interval):
+        """
+        Submit (or resume) one batch job and poll it to completion.
+
+        If the state file already records a batch ID for this stage, the
+        existing batch is polled instead of submitting a new one - this is
+        what makes a crashed job resumable without double billing.
+
+        Returns:
+            dict mapping custom_id -> (succeeded, response_text_or_error)
+        """
+        # All stages share the same API credentials. The Message Batches
+        # API lives under the beta namespace in the pinned SDK (0.40.0).
+        batches = self.classifier.client.beta.messages.batches
+
+        batch_id = state.get(stage_key)
+        if batch_id:
+            _say(f"  Resuming existing {stage_key} batch: {batch_id}")
+        else:
+            batch = batches.create(requests=requests)
+            batch_id = batch.id
+            state[stage_key] = batch_id
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(json.dumps(state, indent=2))
+            _say(f"  Submitted {stage_key} batch: {batch_id}")
+
+        # Poll until the batch has ended
+        while True:
+            batch = batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            _say(f"  {stage_key} batch status: {batch.processing_status}, waiting...")
+            time.sleep(poll_interval)
+
+        # Stream results; each entry carries our custom_id back
+        responses = {}
+        for entry in batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                responses[entry.custom_id] = (True, entry.result.message.content[0].text)
+            else:
+                responses[entry.custom_id] = (False, f"Batch request {entry.result.type}")
+
+        return responses
+
 def main():
     """
     Main entry point for running the pipeline.
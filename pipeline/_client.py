@@ -0,0 +1,35 @@
+"""
+Shared Anthropic clients for all pipeline stages.
+
+Each stage class previously built its own Anthropic client, which meant
+three separate httpx connection pools - and three separate TLS handshakes
+(~100-300ms each on a cold path) even though every request goes to the
+same host.
+
+All stages now share ONE sync client and ONE async client, so requests
+reuse the same keep-alive sockets. The pool is sized generously enough
+that concurrent batch processing never queues on connections before it
+queues on the rate-limit semaphore.
+
+Note: HTTP/2 multiplexing would squeeze more requests per socket, but
+httpx only enables it when the optional h2 package is installed, so we
+stick with pooled HTTP/1.1 keep-alive here.
+"""
+
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient
+import config
+
+# One pool shared by every stage - sized above MAX_CONCURRENCY so the
+# semaphore in process_batch_async is always the binding constraint.
+_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
+CLIENT = Anthropic(
+    api_key=config.ANTHROPIC_API_KEY,
+    http_client=DefaultHttpxClient(limits=_LIMITS)
+)
+
+ASYNC_CLIENT = AsyncAnthropic(
+    api_key=config.ANTHROPIC_API_KEY,
+    http_client=DefaultAsyncHttpxClient(limits=_LIMITS)
+)
@@ -0,0 +1,63 @@
+"""
+Leveled Batch I/O - Group Side-Effects Out of the Hot Path
+
+Processing an item performs several ordered side-effects: stage log
+records, the routed output file write, and the completion log. Done
+inline, each one touches the disk right in the latency-critical path.
+
+BatchIO instead queues the side-effects as (level, operation) pairs and
+runs them level by level when the batch finalizes:
+
+- Level 0: stage/progress log records
+- Level 1: routed file writes, grouped by destination directory so the
+  filesystem sees all writes to one directory back-to-back (keeps the
+  OS directory cache warm)
+- Level 2: completion log records (must come after the writes they
+  describe actually exist on disk)
+
+Operations deferred while draining (e.g. a route operation queues its own
+completion log) land in their level and still run in order.
+"""
+
+class BatchIO:
+    """
+    Queue of deferred I/O operations, drained in level order.
+    """
+
+    # Well-known levels for pipeline batch finalization
+    LEVEL_LOG = 0
+    LEVEL_ROUTE = 1
+    LEVEL_COMPLETE = 2
+
+    def __init__(self):
+        """Start with empty queues."""
+        self._levels = {}
+
+    def defer(self, level, operation, group=None):
+        """
+        Queue an operation to run when the batch drains.
+
+        Args:
+            level: Execution level (lower levels run first)
+            operation: Zero-argument callable performing the I/O
+            group: Optional sort key - operations in the same level are
+                   ordered by group so related I/O (e.g. writes to the
+                   same directory) runs back-to-back
+        """
+        self._levels.setdefault(level, []).append((group, operation))
+
+    def drain(self):
+        """
+        Run all queued operations, one level at a time.
+
+        Levels are processed in ascending order; operations deferred to a
+        later level while draining still run. Within a level, operations
+        are stable-sorted by group.
+        """
+        while self._levels:
+            level = min(self._levels)
+            entries = self._levels.pop(level)
+            # Stable sort; ungrouped operations keep insertion order at the end
+            entries.sort(key=lambda entry: (entry[0] is None, entry[0] or ""))
+            for _, operation in entries:
+                operation()
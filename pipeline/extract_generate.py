@@ -0,0 +1,145 @@
+"""
+Fused Extract+Generate - Stages 2 and 3 in One Call
+
+Once content is classified, the remaining two AI stages both make Claude
+re-read the same content - and the metadata from stage 2 exists only to
+feed stage 3's prompt. Claude can produce both in one pass, so this module
+merges them into a single call that returns
+{"metadata": {...}, "headlines": {...}}.
+
+Compared to running the stages separately:
+- One round-trip instead of two (~50% of the post-classification wall time)
+- The content is transmitted (and billed) once instead of twice
+
+Enabled via config.FUSE_STAGES_23; the staged path stays the default so
+the two can be compared. This is a smaller, lower-risk sibling of the
+fully fused pipeline in pipeline/fused.py, which also folds in
+classification.
+"""
+
+import json
+import config
+from ._client import CLIENT
+from .logger import pipeline_logger, Stage, Status
+from .utils import (
+    extract_json_from_response,
+    validate_dict_keys,
+    collect_streamed_json,
+    truncate_smart,
+)
+from .extractor import EXTRACTION_SYSTEM_PROMPTS
+from .generator import GENERATOR_SYSTEM_PROMPT
+
+# Per-item user message template (the only part that varies per request)
+_USER_TMPL = """<content>
+{content}
+</content>
+
+Extract metadata from the content above, then write the three headlines.
+Respond with one JSON object: {{"metadata": {{...}}, "headlines": {{...}}}}"""
+
+def _build_combined_prompt(extraction_prompt):
+    """
+    Concatenate one extraction schema with the headline persona, wrapped
+    with instructions to emit both results in one JSON object.
+    """
+    return (
+        "You perform TWO tasks on the sports content provided by the user: "
+        "extract structured metadata, then write three audience-specific headlines "
+        "informed by that metadata.\n\n"
+        "TASK 1 - EXTRACT METADATA\n"
+        + extraction_prompt
+        + "\n\nTASK 2 - GENERATE HEADLINES\n"
+        + GENERATOR_SYSTEM_PROMPT
+        + "\n\nRespond with ONE JSON object of this shape:\n"
+        '{"metadata": {...task 1 result...}, "headlines": {...task 2 result...}}'
+    )
+
+# Combined system blocks prebuilt once at import, one per content type;
+# marked with cache_control so the invariant text is served from the
+# prompt cache (one entry per type)
+_SYSTEM_BLOCKS = {
+    content_type: [{
+        "type": "text",
+        "text": _build_combined_prompt(text),
+        "cache_control": {"type": "ephemeral"}
+    }]
+    for content_type, text in EXTRACTION_SYSTEM_PROMPTS.items()
+}
+
+def _system_blocks(content_type):
+    """Look up the prebuilt combined system blocks for a content type."""
+    return _SYSTEM_BLOCKS.get(content_type, _SYSTEM_BLOCKS["other"])
+
+def extract_and_generate(content, content_type, input_id):
+    """
+    Run metadata extraction and headline generation in one API call.
+
+    Args:
+        content: The raw text content
+        content_type: The classification from Stage 1
+        input_id: Unique identifier for tracking
+
+    Returns:
+        tuple: (metadata dict, headlines dict) - same structures the
+               staged MetadataExtractor.extract and
+               HeadlineGenerator.generate return
+    """
+
+    user_message = _USER_TMPL.format(
+        content=truncate_smart(content, config.STAGE_INPUT_BUDGETS["extract"])
+    )
+
+    try:
+        # One call needs budget for both outputs; generation's creative
+        # temperature wins since headlines are the quality-sensitive half
+        with CLIENT.messages.stream(
+            model=config.GENERATOR_MODEL,
+            max_tokens=config.EXTRACTOR_MAX_TOKENS + config.GENERATOR_MAX_TOKENS,
+            temperature=0.7,
+            system=_system_blocks(content_type),
+            messages=[{
+                "role": "user",
+                "content": user_message
+            }]
+        ) as stream:
+            response_text = collect_streamed_json(stream.text_stream)
+
+        result = extract_json_from_response(
+            response_text,
+            context=f"extract+generate for {input_id}"
+        )
+
+        # Validate both halves the same way the staged pipeline does
+        validate_dict_keys(
+            result,
+            ["metadata", "headlines"],
+            context="Extract+generate result"
+        )
+
+        if not isinstance(result["metadata"], dict):
+            raise ValueError(f"Expected metadata object, got {type(result['metadata']).__name__}")
+
+        validate_dict_keys(
+            result["headlines"],
+            ["neutral", "fan_oriented", "casual_viewer"],
+            context="Extract+generate headlines"
+        )
+
+        pipeline_logger.log_stage(
+            Stage.EXTRACT_GENERATE, Status.SUCCESS, input_id,
+            {
+                "teams_found": len(result["metadata"].get("teams", [])),
+                "headline_count": 3
+            }
+        )
+
+        return result["metadata"], result["headlines"]
+
+    except json.JSONDecodeError as e:
+        pipeline_logger.log_error(input_id, Stage.EXTRACT_GENERATE, e)
+        raise Exception(f"Failed to parse extract+generate response: {e}")
+
+    except Exception as e:
+        pipeline_logger.log_error(input_id, Stage.EXTRACT_GENERATE, e)
+        raise Exception(f"Extract+generate failed: {e}")
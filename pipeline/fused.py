@@ -0,0 +1,181 @@
+"""
+Fused Processor - All Three AI Stages in One Call
+
+This module collapses classify -> extract -> generate into a SINGLE Claude
+call that returns all three results as one JSON object.
+
+WHY FUSE THE STAGES?
+The staged pipeline makes three round-trips per item, and each one:
+- Pays network + model startup latency (~300-800ms)
+- Re-sends the full content (input tokens billed three times)
+
+Claude is perfectly capable of doing all three tasks in one pass, so fusing
+them means one round-trip and one transmission of the content.
+
+THE TRADEOFF:
+- Staged: easier to debug, per-stage retries, conditional prompts per type
+- Fused: ~3x fewer round-trips and ~3x less input-token billing
+
+Keep both: config.FUSED_MODE picks which one ContentPipeline.process uses,
+so the two approaches can be A/B compared on real traffic.
+"""
+
+import json
+import config
+from ._client import CLIENT
+from .logger import pipeline_logger, Stage, Status
+from .utils import extract_json_from_response, validate_dict_keys
+
+# Allowed categories, derived from the routing table (see classifier.py)
+_VALID_TYPES = frozenset(config.CONTENT_TYPE_DIRS)
+
+class FusedProcessor:
+    """
+    Runs classification, extraction and headline generation in one API call.
+    """
+
+    def __init__(self):
+        """Attach the shared Anthropic client (see pipeline/_client.py)."""
+        self.client = CLIENT
+
+    def run(self, content, input_id):
+        """
+        Process content through all three AI stages with a single call.
+
+        Args:
+            content: The raw text content to process
+            input_id: Unique identifier for tracking
+
+        Returns:
+            dict with keys:
+                - classification: Same structure as ContentClassifier.classify
+                - metadata: Same structure as MetadataExtractor.extract
+                - headlines: Same structure as HeadlineGenerator.generate
+        """
+
+        prompt = self._build_fused_prompt(content)
+
+        try:
+            response = self.client.messages.create(
+                model=config.GENERATOR_MODEL,
+                max_tokens=config.MAX_TOKENS,
+                temperature=config.TEMPERATURE,
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }]
+            )
+
+            response_text = response.content[0].text
+
+            result = extract_json_from_response(
+                response_text,
+                context=f"fused processing for {input_id}"
+            )
+
+            # The fused response must contain all three stage outputs
+            validate_dict_keys(
+                result,
+                ["classification", "metadata", "headlines"],
+                context="Fused processing result"
+            )
+
+            # Validate each sub-object the same way the staged pipeline does
+            validate_dict_keys(
+                result["classification"],
+                ["content_type", "confidence", "reasoning"],
+                context="Fused classification"
+            )
+
+            if result["classification"]["content_type"] not in _VALID_TYPES:
+                raise ValueError(f"Invalid content_type: {result['classification']['content_type']}")
+
+            if not isinstance(result["metadata"], dict):
+                raise ValueError(f"Expected metadata object, got {type(result['metadata']).__name__}")
+
+            validate_dict_keys(
+                result["headlines"],
+                ["neutral", "fan_oriented", "casual_viewer"],
+                context="Fused headlines"
+            )
+
+            # Log success
+            pipeline_logger.log_stage(
+                Stage.FUSED, Status.SUCCESS, input_id,
+                {
+                    "content_type": result["classification"]["content_type"],
+                    "confidence": result["classification"]["confidence"]
+                }
+            )
+
+            return result
+
+        except json.JSONDecodeError as e:
+            pipeline_logger.log_error(input_id, Stage.FUSED, e)
+            raise Exception(f"Failed to parse fused processing response as JSON: {e}")
+
+        except Exception as e:
+            pipeline_logger.log_error(input_id, Stage.FUSED, e)
+            raise Exception(f"Fused processing failed: {e}")
+
+    def _build_fused_prompt(self, content):
+        """
+        Build the fused prompt combining all three stage instructions.
+
+        The content appears ONCE, followed by the classification categories,
+        the metadata fields, and the headline guidelines from the three
+        staged prompts.
+        """
+        return f"""You are a sports content processing system. Analyze the following content and perform THREE tasks in one pass: classify it, extract metadata, and write headlines.
+
+<content>
+{content}
+</content>
+
+TASK 1 - CLASSIFY into ONE of these categories:
+1. match_report - Live game coverage, post-match reports, match summaries
+2. transfer_news - Player transfers, signings, contract extensions, loan deals
+3. injury_update - Player injuries, recovery timelines, fitness updates
+4. opinion_piece - Analysis, editorials, opinion columns, tactical breakdowns
+5. other - Anything that doesn't fit the above categories
+
+TASK 2 - EXTRACT metadata appropriate to the category you chose:
+- teams: List of team names mentioned
+- players: List of player names mentioned
+- competition: League/tournament name
+- sentiment: positive/negative/neutral
+- key_stats: The important numbers for this category (score and goalscorers
+  for a match report, transfer fee and clubs for transfer news, injury type
+  and timeline for an injury update, main arguments for an opinion piece)
+If a field is not present in the content, use null or empty list as appropriate.
+
+TASK 3 - GENERATE three headlines:
+- neutral: Objective, factual headline for general sports news sites (BBC Sport, ESPN). Formal tone. 8-12 words.
+- fan_oriented: Exciting headline for team supporters. Can use nicknames, show emotion. 6-10 words.
+- casual_viewer: Context-rich headline for casual fans who may not follow closely. Explain what's significant. 10-15 words.
+
+Respond in JSON format with this exact structure:
+{{
+    "classification": {{
+        "content_type": "one of the 5 categories above",
+        "confidence": 0.95,
+        "reasoning": "Brief explanation of why you chose this category"
+    }},
+    "metadata": {{
+        "teams": [],
+        "players": [],
+        "competition": null,
+        "sentiment": "neutral",
+        "key_stats": {{}}
+    }},
+    "headlines": {{
+        "neutral": "...",
+        "fan_oriented": "...",
+        "casual_viewer": "..."
+    }}
+}}
+
+Now process the content above."""
+
+# Create singleton instance
+fused_processor = FusedProcessor()
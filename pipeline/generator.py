@@ -19,10 +19,83 @@ PROMPT ENGINEERING TECHNIQUES:
 """
 
 import json
-from anthropic import Anthropic
 import config
-from .logger import pipeline_logger
-from .utils import extract_json_from_response, validate_dict_keys
+from ._client import CLIENT, ASYNC_CLIENT
+from .logger import pipeline_logger, Stage, Status
+from .utils import (
+    extract_json_from_response,
+    validate_dict_keys,
+    collect_streamed_json,
+    acollect_streamed_json,
+    truncate_smart,
+)
+
+# Static persona + guidelines + examples, shared by every generation call.
+#
+# PROMPT CACHING: this block never changes between requests, so it is sent
+# as a system block marked with cache_control: ephemeral and Anthropic
+# caches the processed prefix. Keep it byte-identical between calls so the
+# cache key matches.
+GENERATOR_SYSTEM_PROMPT = """You are a sports headline writer. Generate THREE versions of a headline for the content provided by the user.
+
+Generate three headlines in JSON format:
+
+{
+    "neutral": "Objective, factual headline for general sports news sites (BBC Sport, ESPN). Formal tone. 8-12 words.",
+    "fan_oriented": "Exciting headline for team supporters. Can use nicknames, show emotion. 6-10 words.",
+    "casual_viewer": "Context-rich headline for casual fans who may not follow closely. Explain what's significant. 10-15 words."
+}
+
+GUIDELINES:
+- Neutral: Focus on facts, scores, key events. No emotion.
+- Fan-oriented: Celebrate/commiserate with fans. Use team nicknames ("Red Devils", "Lakers"). Show passion.
+- Casual viewer: Add context they need ("rivals", "title race", "playoff push"). Explain significance.
+
+Examples for a Man United win:
+{
+    "neutral": "Manchester United defeat Liverpool 2-1 at Old Trafford",
+    "fan_oriented": "Red Devils sink Liverpool with late winner!",
+    "casual_viewer": "Manchester United beat historic rivals Liverpool 2-1 in crucial Premier League match"
+}"""
+
+# Per-item user message template, hoisted to module scope so each call is
+# a single .format substitution instead of rebuilding the literal parts.
+GENERATOR_USER_TMPL = """CONTEXT:
+
+Content type: {content_type}
+Teams involved: {teams}
+Key players: {players}
+Competition: {competition}
+Sentiment: {sentiment}
+
+CONTENT:
+<content>
+{content_excerpt}...
+</content>
+
+Now generate headlines for the content above. Respond in JSON."""
+
+# System blocks prebuilt once at import (see classifier.py for rationale)
+_SYSTEM_BLOCKS = [{
+    "type": "text",
+    "text": GENERATOR_SYSTEM_PROMPT,
+    "cache_control": {"type": "ephemeral"}
+}]
+
+# Tool schema for structured outputs: all three headline variants, typed.
+GENERATOR_TOOL = {
+    "name": "emit_headlines",
+    "description": "Record the three audience-specific headlines.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "neutral": {"type": "string"},
+            "fan_oriented": {"type": "string"},
+            "casual_viewer": {"type": "string"}
+        },
+        "required": ["neutral", "fan_oriented", "casual_viewer"]
+    }
+}
 
 class HeadlineGenerator:
     """
@@ -30,8 +103,11 @@ class HeadlineGenerator:
     """
     
     def __init__(self):
-        """Initialize the Anthropic client."""
-        self.client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
+        """Attach the shared sync and async Anthropic clients."""
+        # Shared pooled clients (see pipeline/_client.py) - all stages reuse
+        # the same keep-alive connections instead of opening their own.
+        self.client = CLIENT
+        self.aclient = ASYNC_CLIENT
     
     def generate(self, content, metadata, content_type, input_id):
         """
@@ -50,109 +126,173 @@ class HeadlineGenerator:
                 - casual_viewer: Context-rich headline for casual fans
         """
         
-        # Build the generation prompt using metadata for context
-        prompt = self._build_generation_prompt(content, metadata, content_type)
+        # Build the per-item user message using metadata for context
+        user_message = self._build_user_message(content, metadata, content_type)
         
         try:
-            # Make the API call
-            response = self.client.messages.create(
-                model=config.MODEL_NAME,
-                max_tokens=config.MAX_TOKENS,
-                temperature=0.7,  # Higher temperature for creativity in headline writing
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-            
-            # Extract and parse response
-            response_text = response.content[0].text
-            
-            # Parse JSON response with robust extraction
-            headlines = extract_json_from_response(
-                response_text,
-                context=f"headline generation for {input_id}"
-            )
-            
-            # Validate structure
-            validate_dict_keys(
-                headlines,
-                ["neutral", "fan_oriented", "casual_viewer"],
-                context="Headline generation result"
-            )
-            
-            # Log success
-            pipeline_logger.log_stage(
-                "GENERATE", "SUCCESS", input_id,
-                {"headline_count": 3}
-            )
+            if config.STRUCTURED_OUTPUTS:
+                # Force a tool call - the result arrives as a typed dict,
+                # so there is nothing to salvage-parse
+                response = self.client.messages.create(
+                    model=config.GENERATOR_MODEL,
+                    max_tokens=config.GENERATOR_MAX_TOKENS,
+                    temperature=0.7,  # Higher temperature for creativity in headline writing
+                    system=self._system_blocks(),
+                    messages=[{
+                        "role": "user",
+                        "content": user_message
+                    }],
+                    tools=[GENERATOR_TOOL],
+                    tool_choice={"type": "tool", "name": "emit_headlines"}
+                )
+                headlines = response.content[0].input
+            else:
+                # Text mode: stream the response and stop reading as soon
+                # as the JSON object closes
+                with self.client.messages.stream(
+                    model=config.GENERATOR_MODEL,
+                    max_tokens=config.GENERATOR_MAX_TOKENS,
+                    temperature=0.7,  # Higher temperature for creativity in headline writing
+                    system=self._system_blocks(),
+                    messages=[{
+                        "role": "user",
+                        "content": user_message
+                    }]
+                ) as stream:
+                    response_text = collect_streamed_json(stream.text_stream)
+                headlines = extract_json_from_response(
+                    response_text,
+                    context=f"headline generation for {input_id}"
+                )
+
+            return self._validate_result(headlines, input_id)
             
-            return headlines
+        except json.JSONDecodeError as e:
+            pipeline_logger.log_error(input_id, Stage.GENERATE, e)
+            raise Exception(f"Failed to parse headline generation response: {e}")
+        
+        except Exception as e:
+            pipeline_logger.log_error(input_id, Stage.GENERATE, e)
+            raise Exception(f"Headline generation failed: {e}")
+    
+    async def agenerate(self, content, metadata, content_type, input_id):
+        """
+        Async version of generate() for concurrent batch processing.
+        
+        Same prompt, parsing and validation as generate() - only the transport
+        differs (awaits the AsyncAnthropic client instead of blocking).
+        """
+        
+        user_message = self._build_user_message(content, metadata, content_type)
+        
+        try:
+            if config.STRUCTURED_OUTPUTS:
+                response = await self.aclient.messages.create(
+                    model=config.GENERATOR_MODEL,
+                    max_tokens=config.GENERATOR_MAX_TOKENS,
+                    temperature=0.7,  # Higher temperature for creativity in headline writing
+                    system=self._system_blocks(),
+                    messages=[{
+                        "role": "user",
+                        "content": user_message
+                    }],
+                    tools=[GENERATOR_TOOL],
+                    tool_choice={"type": "tool", "name": "emit_headlines"}
+                )
+                headlines = response.content[0].input
+            else:
+                async with self.aclient.messages.stream(
+                    model=config.GENERATOR_MODEL,
+                    max_tokens=config.GENERATOR_MAX_TOKENS,
+                    temperature=0.7,  # Higher temperature for creativity in headline writing
+                    system=self._system_blocks(),
+                    messages=[{
+                        "role": "user",
+                        "content": user_message
+                    }]
+                ) as stream:
+                    response_text = await acollect_streamed_json(stream.text_stream)
+                headlines = extract_json_from_response(
+                    response_text,
+                    context=f"headline generation for {input_id}"
+                )
+
+            return self._validate_result(headlines, input_id)
             
         except json.JSONDecodeError as e:
-            pipeline_logger.log_error(input_id, "GENERATE", e)
+            pipeline_logger.log_error(input_id, Stage.GENERATE, e)
             raise Exception(f"Failed to parse headline generation response: {e}")
         
         except Exception as e:
-            pipeline_logger.log_error(input_id, "GENERATE", e)
+            pipeline_logger.log_error(input_id, Stage.GENERATE, e)
             raise Exception(f"Headline generation failed: {e}")
     
-    def _build_generation_prompt(self, content, metadata, content_type):
+    def _parse_response(self, response_text, input_id):
         """
-        Build a context-aware prompt for headline generation.
+        Parse and validate a generation text response.
         
-        Uses metadata to inform headline writing - this is where CHAINING shows value.
-        Stage 2's output makes Stage 3's output better.
+        Used by the text fallback and the offline batch path, which receive
+        raw response text rather than a tool-call dict.
+        """
+        headlines = extract_json_from_response(
+            response_text,
+            context=f"headline generation for {input_id}"
+        )
+        return self._validate_result(headlines, input_id)
+    
+    def _validate_result(self, headlines, input_id):
+        """
+        Validate a headlines result dict (shared by all transports).
         """
         
-        # Extract useful context from metadata
-        teams = metadata.get("teams", [])
-        players = metadata.get("players", [])
-        competition = metadata.get("competition", "")
-        sentiment = metadata.get("sentiment", "neutral")
+        # Validate structure
+        validate_dict_keys(
+            headlines,
+            ["neutral", "fan_oriented", "casual_viewer"],
+            context="Headline generation result"
+        )
         
-        # Build context string
-        context = f"""
-Content type: {content_type}
-Teams involved: {', '.join(teams) if teams else 'N/A'}
-Key players: {', '.join(players[:3]) if players else 'N/A'}  
-Competition: {competition if competition else 'N/A'}
-Sentiment: {sentiment}
-"""
+        # Log success
+        pipeline_logger.log_stage(
+            Stage.GENERATE, Status.SUCCESS, input_id,
+            {"headline_count": 3}
+        )
         
-        prompt = f"""You are a sports headline writer. Generate THREE versions of a headline for this content.
-
-CONTEXT:
-{context}
-
-CONTENT:
-<content>
-{content[:500]}...
-</content>
-
-Generate three headlines in JSON format:
+        return headlines
+    
+    def _system_blocks(self):
+        """
+        Return the prebuilt cacheable system blocks (see _SYSTEM_BLOCKS).
 
-{{
-    "neutral": "Objective, factual headline for general sports news sites (BBC Sport, ESPN). Formal tone. 8-12 words.",
-    "fan_oriented": "Exciting headline for team supporters. Can use nicknames, show emotion. 6-10 words.",
-    "casual_viewer": "Context-rich headline for casual fans who may not follow closely. Explain what's significant. 10-15 words."
-}}
+        The cache_control marker tells Anthropic to cache the processed
+        persona + guidelines + examples so repeat calls get them at ~10%
+        of the price.
+        """
+        return _SYSTEM_BLOCKS
 
-GUIDELINES:
-- Neutral: Focus on facts, scores, key events. No emotion.
-- Fan-oriented: Celebrate/commiserate with fans. Use team nicknames ("Red Devils", "Lakers"). Show passion.
-- Casual viewer: Add context they need ("rivals", "title race", "playoff push"). Explain significance.
+    def _build_user_message(self, content, metadata, content_type):
+        """
+        Build the per-item user message with context from earlier stages.
 
-Examples for a Man United win:
-{{
-    "neutral": "Manchester United defeat Liverpool 2-1 at Old Trafford",
-    "fan_oriented": "Red Devils sink Liverpool with late winner!",
-    "casual_viewer": "Manchester United beat historic rivals Liverpool 2-1 in crucial Premier League match"
-}}
+        Uses metadata to inform headline writing - this is where CHAINING shows value.
+        Stage 2's output makes Stage 3's output better. This part varies per
+        item, so it is the only part that misses the prompt cache.
+        """
 
-Now generate headlines for the content above:"""
+        # Extract useful context from metadata
+        teams = metadata.get("teams", [])
+        players = metadata.get("players", [])
+        competition = metadata.get("competition", "")
+        sentiment = metadata.get("sentiment", "neutral")
 
-        return prompt
+        return GENERATOR_USER_TMPL.format(
+            content_type=content_type,
+            teams=', '.join(teams) if teams else 'N/A',
+            players=', '.join(players[:3]) if players else 'N/A',
+            competition=competition if competition else 'N/A',
+            sentiment=sentiment,
+            content_excerpt=truncate_smart(content, config.STAGE_INPUT_BUDGETS["generate"])
+        )
 
 # Create singleton instance
 generator = HeadlineGenerator()
@@ -10,12 +10,126 @@ Key concepts:
 - Context tracking: Each processed item has an ID that appears in all its log entries
 """
 
+import atexit
+import enum
+import functools
 import logging
+import logging.handlers
 import json
+import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
 import config
 
+try:
+    # Same optional dependency as elsewhere in the pipeline: serializes
+    # the structured records faster when present, stdlib otherwise.
+    import orjson
+except ImportError:
+    orjson = None
+
+class Stage(str, enum.Enum):
+    """
+    The pipeline stages that appear in log records.
+
+    Subclassing str keeps every existing string caller working (members
+    compare equal to their plain-string values and serialize identically),
+    while enum members give new callers typo-proof constants that dispatch
+    by identity.
+    """
+    CLASSIFY = "CLASSIFY"
+    EXTRACT = "EXTRACT"
+    EXTRACT_GENERATE = "EXTRACT_GENERATE"
+    GENERATE = "GENERATE"
+    ROUTE = "ROUTE"
+    FUSED = "FUSED"
+    PROCESS_START = "PROCESS_START"
+    PROCESS_COMPLETE = "PROCESS_COMPLETE"
+
+    # Render as the bare value (not "Stage.CLASSIFY") in formatted records
+    __str__ = str.__str__
+
+class Status(str, enum.Enum):
+    """Outcome vocabulary for log records (see Stage for the str mixin)."""
+    SUCCESS = "SUCCESS"
+    FAILURE = "FAILURE"
+
+    __str__ = str.__str__
+
+# Format: [timestamp] LEVEL - message. The formatter is stateless, so one
+# module-level instance serves every handler instead of being rebuilt per
+# PipelineLogger construction.
+_FORMATTER = logging.Formatter(
+    '[%(asctime)s] %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+class JSONFormatter(logging.Formatter):
+    """
+    Serialize structured pipeline records to JSON at emit time.
+
+    log_stage attaches its fields to the record via extra= instead of
+    pre-serializing them, so the JSON string is only built when a record
+    actually reaches the file handler - filtered records cost nothing,
+    and buffered records are serialized at flush time, off the hot path.
+    """
+
+    def format(self, record):
+        if not hasattr(record, "stage"):
+            # Not a pipeline record (e.g. library logging) - format normally
+            return super().format(record)
+
+        # The outer object is assembled by f-string instead of dict +
+        # dumps: timestamp/stage/status are pipeline-generated values from
+        # a controlled vocabulary, so only the caller-supplied fields -
+        # input_id and details - go through a real serializer for escaping
+        timestamp = datetime.fromtimestamp(record.created).isoformat()
+        head = (
+            f'{{"timestamp":"{timestamp}","stage":"{record.stage}",'
+            f'"status":"{record.status}","input_id":{json.dumps(record.input_id)}'
+        )
+
+        details = getattr(record, "details", None)
+        if not details:
+            return head + '}'
+
+        if orjson is not None:
+            details_json = orjson.dumps(details).decode()
+        else:
+            details_json = json.dumps(details)
+        return f'{head},"details":{details_json}}}'
+
+_JSON_FORMATTER = JSONFormatter()
+
+class AtomicAppendHandler(logging.Handler):
+    """
+    Write each formatted record with one os.write to an O_APPEND fd.
+
+    FileHandler goes through a buffered text stream - encode, buffer copy,
+    flush - per record. This handler opens the log file once in append
+    mode and emits each line as a single positional-append write; POSIX
+    guarantees O_APPEND writes land contiguously, so lines from different
+    threads never interleave even without extra coordination.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def emit(self, record):
+        try:
+            os.write(self._fd, (self.format(record) + "\n").encode())
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        try:
+            os.close(self._fd)
+        finally:
+            super().close()
+
 class PipelineLogger:
     """
     Custom logger for the content pipeline.
@@ -41,33 +155,83 @@ class PipelineLogger:
         
         # Prevent duplicate logs if logger already has handlers
         if not self.logger.handlers:
-            # File handler - writes detailed logs to file
-            file_handler = logging.FileHandler(f"{log_dir}/{log_file}")
+            # File handler - appends detailed logs with one write per record
+            file_handler = AtomicAppendHandler(f"{log_dir}/{log_file}")
             file_handler.setLevel(logging.DEBUG)
             
             # Console handler - shows info/warning/error in terminal
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             
-            # Format: [timestamp] LEVEL - message
-            formatter = logging.Formatter(
-                '[%(asctime)s] %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
+            # File gets machine-parseable JSON; console keeps the short
+            # human-readable line (each side serializes once, lazily)
+            file_handler.setFormatter(_JSON_FORMATTER)
+            console_handler.setFormatter(_FORMATTER)
+            
+            # Buffer file records in memory and write them in batches -
+            # otherwise every log_stage call costs a write() syscall right
+            # in the middle of the latency-critical path. ERRORs flush
+            # immediately so failures always reach disk.
+            buffered_handler = logging.handlers.MemoryHandler(
+                capacity=config.LOG_BUFFER_RECORDS,
+                flushLevel=logging.ERROR,
+                target=file_handler
             )
             
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
+            # The producing thread only enqueues the record; a QueueListener
+            # thread feeds the buffered handler, so even a slow disk never
+            # stalls pipeline threads mid-item. Buffering still batches the
+            # actual write() calls - the queue just moves them off-thread.
+            log_queue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            self._listener = logging.handlers.QueueListener(
+                log_queue, buffered_handler, respect_handler_level=True
+            )
+            self._listener.start()
+            self._listener_stopped = False
             
-            self.logger.addHandler(file_handler)
+            self.logger.addHandler(queue_handler)
             self.logger.addHandler(console_handler)
+            
+            self._buffered_handler = buffered_handler
+            
+            # Periodic flush so a quiet pipeline still gets its records to
+            # disk within LOG_FLUSH_INTERVAL_MS
+            self._start_flush_timer()
+
+            # On interpreter shutdown: drain the queue into the buffer,
+            # then the buffer to disk, so no records are lost
+            atexit.register(self._shutdown)
+
+    def _shutdown(self):
+        """Stop the listener (draining its queue) and flush the buffer."""
+        if not self._listener_stopped:
+            self._listener_stopped = True
+            self._listener.stop()
+        self.flush()
+    
+    def _start_flush_timer(self):
+        """Schedule the next periodic buffer flush on a daemon timer."""
+        def flush_and_reschedule():
+            self.flush()
+            self._start_flush_timer()
+        
+        timer = threading.Timer(config.LOG_FLUSH_INTERVAL_MS / 1000, flush_and_reschedule)
+        timer.daemon = True
+        timer.start()
+    
+    def flush(self):
+        """Flush any buffered log records to the log file."""
+        if hasattr(self, '_buffered_handler'):
+            self._buffered_handler.flush()
     
     def log_stage(self, stage, status, input_id, details=None):
         """
         Log a pipeline stage completion.
         
         Args:
-            stage: Which stage (CLASSIFY, EXTRACT, GENERATE, ROUTE)
-            status: SUCCESS or FAILURE
+            stage: Which stage - a Stage member or its string value
+            status: Status.SUCCESS / Status.FAILURE or the plain strings
             input_id: Unique identifier for the input being processed
             details: Additional information (dict)
         
@@ -75,38 +239,49 @@ class PipelineLogger:
             logger.log_stage("CLASSIFY", "SUCCESS", "article_001", 
                            {"content_type": "match_report", "confidence": 0.95})
         """
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
+        # Fields ride on the record via extra= and are serialized lazily:
+        # the file handler's JSONFormatter builds the JSON line only when
+        # the record is actually emitted, and the console renders the
+        # plain %-style message. Nothing is formatted for filtered records.
+        extra = {
             "stage": stage,
             "status": status,
             "input_id": input_id,
+            "details": details,
         }
         
-        if details:
-            log_entry["details"] = details
-        
-        # Log as JSON for easy parsing later
-        message = json.dumps(log_entry)
-        
-        if status == "SUCCESS":
-            self.logger.info(message)
+        # str-enum members compare equal to their plain-string values, so
+        # one equality check covers both caller styles
+        if status == Status.SUCCESS:
+            self.logger.info("%s %s %s", stage, status, input_id, extra=extra)
         else:
-            self.logger.error(message)
+            self.logger.error("%s %s %s", stage, status, input_id, extra=extra)
     
     def log_start(self, input_id, source=None):
         """Log the start of processing for a new item."""
         details = {"source": source} if source else {}
-        self.log_stage("PROCESS_START", "SUCCESS", input_id, details)
+        self.log_stage(Stage.PROCESS_START, Status.SUCCESS, input_id, details)
     
     def log_complete(self, input_id, output_path):
         """Log successful completion of entire pipeline."""
-        self.log_stage("PROCESS_COMPLETE", "SUCCESS", input_id, 
+        self.log_stage(Stage.PROCESS_COMPLETE, Status.SUCCESS, input_id, 
                       {"output_path": output_path})
     
     def log_error(self, input_id, stage, error):
         """Log an error that occurred during processing."""
-        self.log_stage(stage, "FAILURE", input_id, 
+        self.log_stage(stage, Status.FAILURE, input_id, 
                       {"error": str(error), "error_type": type(error).__name__})
 
+@functools.lru_cache(maxsize=None)
+def get_pipeline_logger(log_dir=config.LOG_DIR, log_file=config.LOG_FILE):
+    """
+    Memoized PipelineLogger factory.
+
+    Construction stats/creates the log directory and wires handlers, so a
+    worker or test that triggers it again for the same destination should
+    get the existing instance back rather than redo the setup I/O.
+    """
+    return PipelineLogger(log_dir, log_file)
+
 # Create a singleton instance that can be imported by other modules
-pipeline_logger = PipelineLogger()
+pipeline_logger = get_pipeline_logger()
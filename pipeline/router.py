@@ -19,25 +19,100 @@ WHY ROUTING MATTERS:
 Each downstream system needs different content types.
 """
 
+import functools
 import json
+import os
 from pathlib import Path
-from datetime import datetime
 import config
-from .logger import pipeline_logger
+from .logger import pipeline_logger, Stage, Status
+from .utils import now_iso
+
+try:
+    # orjson serializes the multi-KB output packages several times faster
+    # than stdlib json and produces bytes directly, so the file can be
+    # opened in binary mode and skip the text-layer encode entirely.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional binary output format (see ContentRouter output_format):
+    # MessagePack packs the same package noticeably smaller and faster to
+    # re-read than pretty JSON, at the cost of human inspectability.
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    # Linux io_uring bindings for UringRouter's batched writes. Optional
+    # and deliberately opt-in: the plain ContentRouter stays the default.
+    import liburing
+except ImportError:
+    liburing = None
+
+# Config values bound to module constants at import: every later read is
+# a module-global lookup instead of an attribute access on the config
+# module, and the snapshot makes clear these don't change mid-process
+_OUTPUT_DIR = config.OUTPUT_DIR
+_CONTENT_TYPE_DIRS = config.CONTENT_TYPE_DIRS
+
+# Turns an ISO8601 second ("2024-05-01T12:30:59") into the compact
+# filename stamp ("20240501_123059") without a second strftime call
+_STAMP_TRANSLATION = str.maketrans({'-': None, ':': None, 'T': '_'})
+
+# Reused stdlib encoder for the no-orjson fallback; iterencode streams the
+# output in chunks instead of materializing one giant string
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
 
 class ContentRouter:
     """
     Routes processed content to appropriate output destinations.
     """
     
-    def __init__(self):
-        """Initialize router and ensure output directories exist."""
-        self.output_dir = Path(config.OUTPUT_DIR)
-        self.content_type_dirs = config.CONTENT_TYPE_DIRS
+    def __init__(self, output_format="json"):
+        """
+        Initialize router and ensure output directories exist.
+
+        Args:
+            output_format: "json" (default - human-inspectable, what the
+                           test-runner walkthrough expects) or "msgpack"
+                           for compact binary packages, when downstream
+                           consumers are machines rather than people
+        """
+        if output_format not in ("json", "msgpack"):
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format == "msgpack" and msgpack is None:
+            raise ValueError(
+                "msgpack output requested but the msgpack package is not installed"
+            )
+        self.output_format = output_format
+        
+        self.output_dir = Path(_OUTPUT_DIR)
+        self.content_type_dirs = _CONTENT_TYPE_DIRS
         
-        # Create all output directories if they don't exist
-        for dir_name in self.content_type_dirs.values():
-            (self.output_dir / dir_name).mkdir(parents=True, exist_ok=True)
+        # Destination Path per content type, built once - route() runs per
+        # item, and repeated Path joins allocate a fresh object every time
+        self._dir_cache = {
+            content_type: self.output_dir / dir_name
+            for content_type, dir_name in self.content_type_dirs.items()
+        }
+        self._other_dir = self._dir_cache["other"]
+        
+        # String prefix per content type for route()'s hot path - plain
+        # concatenation is cheaper than two PurePath joins plus the final
+        # str() per item, and open() takes the string directly
+        self._prefix = {
+            content_type: os.path.join(_OUTPUT_DIR, dir_name) + os.sep
+            for content_type, dir_name in self.content_type_dirs.items()
+        }
+        self._other_prefix = self._prefix["other"]
+        
+        # Create all output directories if they don't exist. Done
+        # unconditionally on every construction: a handful of mkdir calls
+        # is cheap, and it self-heals if a directory was removed between
+        # router instances (which route() and get_routing_stats() rely on)
+        for dir_path in self._dir_cache.values():
+            dir_path.mkdir(parents=True, exist_ok=True)
     
     def route(self, input_id, content_type, original_content, classification, metadata, headlines):
         """
@@ -58,13 +133,19 @@ class ContentRouter:
         try:
             # Determine output directory based on content type
             # If content_type not in our mapping, use "other"
+            prefix = self._prefix.get(content_type, self._other_prefix)
             dir_name = self.content_type_dirs.get(content_type, "other")
-            output_path = self.output_dir / dir_name
+            
+            # One timestamp per route call - reused for both processed_at
+            # and the filename (two separate now() calls could disagree
+            # across a second boundary), and cached per second so repeat
+            # routes within a second skip the formatting entirely
+            processed_at = now_iso()
             
             # Create the output package - all pipeline results in one JSON
             output_package = {
                 "input_id": input_id,
-                "processed_at": datetime.now().isoformat(),
+                "processed_at": processed_at,
                 "content_type": content_type,
                 "classification": classification,
                 "metadata": metadata,
@@ -73,31 +154,80 @@ class ContentRouter:
                 "pipeline_version": "1.0"  # For tracking if you update the pipeline
             }
             
-            # Create filename with timestamp for uniqueness
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{input_id}_{timestamp}.json"
-            file_path = output_path / filename
+            # Create filename with timestamp for uniqueness, derived from
+            # the same instant as processed_at (ISO punctuation stripped)
+            timestamp = processed_at.translate(_STAMP_TRANSLATION)
+            extension = ".msgpack" if self.output_format == "msgpack" else ".json"
+            file_path = f"{prefix}{input_id}_{timestamp}{extension}"
             
             # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(output_package, f, indent=2, ensure_ascii=False)
+            self._write_package(file_path, output_package)
             
             # Log successful routing
             pipeline_logger.log_stage(
-                "ROUTE", "SUCCESS", input_id,
+                Stage.ROUTE, Status.SUCCESS, input_id,
                 {
                     "destination": dir_name,
-                    "output_file": str(file_path)
+                    "output_file": file_path
                 }
             )
             
-            return str(file_path)
+            return file_path
             
         except Exception as e:
             # Routing should rarely fail (just file I/O), but catch it anyway
-            pipeline_logger.log_error(input_id, "ROUTE", e)
+            pipeline_logger.log_error(input_id, Stage.ROUTE, e)
             raise Exception(f"Routing failed: {e}")
     
+    def _write_package(self, file_path, output_package):
+        """
+        Serialize one output package to disk.
+
+        In msgpack mode the package is packed to compact binary in one
+        call; for JSON, orjson serializes to bytes in one call (still
+        indented for human inspection). Both already return one contiguous
+        bytes object, so it goes straight to an unbuffered handle -
+        buffering=0 skips Python's intermediate buffer, making this
+        exactly one write(). The no-orjson stdlib fallback streams via
+        iterencode, keeping peak memory at O(chunk) instead of O(total
+        output) when original_content is large.
+        """
+        if self.output_format == "msgpack":
+            encoded = msgpack.packb(output_package, use_bin_type=True)
+        elif orjson is not None:
+            encoded = orjson.dumps(output_package, option=orjson.OPT_INDENT_2)
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for chunk in _ENCODER.iterencode(output_package):
+                    f.write(chunk)
+            return
+        
+        with open(file_path, 'wb', buffering=0) as f:
+            f.write(encoded)
+
+    def route_batch(self, items):
+        """
+        Route many processed items in one pass.
+
+        Items are sorted by content_type first so all writes to one
+        destination directory happen back-to-back (keeps the OS directory
+        cache warm, same rationale as BatchIO's grouped level 1).
+
+        Args:
+            items: List of dicts, each holding the keyword arguments that
+                   route() takes
+
+        Returns:
+            list: The saved file path for each item, in input order
+        """
+        order = {id(item): index for index, item in enumerate(items)}
+        paths = [None] * len(items)
+
+        for item in sorted(items, key=lambda item: item.get("content_type", "other")):
+            paths[order[id(item)]] = self.route(**item)
+
+        return paths
+
     def get_routing_stats(self):
         """
         Get statistics about routed content (useful for monitoring).
@@ -106,13 +236,95 @@ class ContentRouter:
             dict: Count of files in each output directory
         """
         stats = {}
-        for content_type, dir_name in self.content_type_dirs.items():
-            dir_path = self.output_dir / dir_name
-            # Count .json files in directory
-            file_count = len(list(dir_path.glob("*.json")))
-            stats[content_type] = file_count
+        for content_type in self.content_type_dirs:
+            # os.scandir streams DirEntry objects with no per-entry stat or
+            # Path allocation, so counting stays cheap even with thousands
+            # of routed outputs in a directory
+            with os.scandir(self._dir_cache[content_type]) as entries:
+                stats[content_type] = sum(
+                    1 for entry in entries
+                    if entry.name.endswith(('.json', '.msgpack'))
+                )
         
         return stats
 
+class UringRouter(ContentRouter):
+    """
+    Router that flushes batch writes through Linux io_uring.
+
+    route() assembles and serializes exactly like ContentRouter, but the
+    bytes are queued instead of written; route_batch then submits every
+    queued write to the kernel as one io_uring batch and reaps the
+    completions together - one submission round for N files instead of N
+    synchronous write paths. Worthwhile when a batch emits hundreds of
+    output files against a fast SSD.
+
+    Note the ROUTE log records are emitted at queue time, slightly ahead
+    of the bytes reaching disk; flush_writes raises if any write failed.
+    Requires the liburing package (Linux only) - construction fails
+    cleanly without it.
+    """
+
+    def __init__(self, output_format="json"):
+        if liburing is None:
+            raise ValueError(
+                "UringRouter requires the liburing package (Linux only); "
+                "use the default ContentRouter otherwise"
+            )
+        super().__init__(output_format=output_format)
+        self._pending = []
+
+    def _write_package(self, file_path, output_package):
+        """Serialize now, write later (see flush_writes)."""
+        if self.output_format == "msgpack":
+            encoded = msgpack.packb(output_package, use_bin_type=True)
+        elif orjson is not None:
+            encoded = orjson.dumps(output_package, option=orjson.OPT_INDENT_2)
+        else:
+            encoded = ''.join(_ENCODER.iterencode(output_package)).encode('utf-8')
+        self._pending.append((file_path, encoded))
+
+    def route_batch(self, items):
+        """Route a batch, then flush all queued writes in one submission."""
+        paths = super().route_batch(items)
+        self.flush_writes()
+        return paths
+
+    def flush_writes(self):
+        """Submit every queued write as one io_uring batch and wait."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        # Files are created with plain os.open (cheap, and keeps error
+        # handling simple); only the data writes go through the ring
+        fds = [
+            os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            for path, _ in pending
+        ]
+        ring = liburing.io_uring()
+        try:
+            liburing.io_uring_queue_init(len(pending), ring, 0)
+            for fd, (_, encoded) in zip(fds, pending):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_write(sqe, fd, encoded, len(encoded), 0)
+            liburing.io_uring_submit(ring)
+
+            # Reap one completion per queued write, surfacing any error
+            cqe = liburing.io_uring_cqe()
+            for _ in pending:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                liburing.trap_error(cqe.res)
+                liburing.io_uring_cqe_seen(ring, cqe)
+        finally:
+            liburing.io_uring_queue_exit(ring)
+            for fd in fds:
+                os.close(fd)
+
+@functools.lru_cache(maxsize=1)
+def get_router():
+    """Memoized ContentRouter factory (construction does directory I/O)."""
+    return ContentRouter()
+
 # Create singleton instance
-router = ContentRouter()
+router = get_router()
@@ -4,8 +4,166 @@ Utility functions for the Sports Content Pipeline.
 This module contains helper functions used across multiple pipeline components.
 """
 
+import functools
+import io
 import json
 import re
+import time
+
+try:
+    # orjson parses the multi-KB responses Claude returns several times
+    # faster than stdlib json. It raises a subclass of json.JSONDecodeError,
+    # so the existing error handling works unchanged.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # ijson streams a document key by key, letting callers that only need
+    # a couple of top-level fields stop parsing at a prefix of the text.
+    # Optional: without it, extract_json_fields falls back to a full parse.
+    import ijson
+except ImportError:
+    ijson = None
+
+# Reusable stdlib decoder whose raw_decode parses one JSON value from any
+# position and reports where it ended - the workhorse for responses that
+# surround their JSON with prose
+_DECODER = json.JSONDecoder()
+
+# Markdown fence pattern, compiled once - extract_json_from_response runs
+# once per LLM response, and re.findall would recompile it every call
+_FENCE_RE = re.compile(r'```(?:json)?\s*\n(.*?)\n```', re.DOTALL)
+
+def _loads(text):
+    """Parse JSON text via orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+@functools.lru_cache(maxsize=1)
+def _iso_for_second(second):
+    """Format one epoch second as local ISO8601 (cached; see now_iso)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+
+
+def now_iso():
+    """
+    Current local time as an ISO8601 string, at second resolution.
+
+    Hot paths stamp every record/output with the current time, and
+    datetime.now().isoformat() builds a datetime object plus a fresh
+    string each call. Clamping to whole seconds lets all calls within the
+    same second share one cached format - the steady-state cost is an
+    integer division and a cache hit.
+    """
+    return _iso_for_second(time.time_ns() // 10**9)
+
+
+def truncate_smart(content, budget):
+    """
+    Truncate content to a character budget, cutting on a paragraph boundary.
+
+    Sending a whole 50kB article to every stage multiplies its token bill
+    for little quality gain - classification needs only the opening
+    paragraphs, and headlines only the lede. Cutting at the last blank
+    line under the budget keeps the excerpt coherent instead of ending
+    mid-sentence.
+
+    Args:
+        content: The raw text content
+        budget: Maximum number of characters to keep
+
+    Returns:
+        str: The original content if it fits, otherwise a truncated copy
+    """
+    if len(content) <= budget:
+        return content
+
+    # Prefer the last paragraph break under the budget; fall back to a
+    # hard cut if the text has no blank lines in range
+    boundary = content.rfind("\n\n", 0, budget)
+    if boundary <= 0:
+        return content[:budget]
+
+    return content[:boundary]
+
+
+def _scan_for_balanced_json(state, chunk):
+    """
+    Advance a brace-balance scan over one chunk of streamed text.
+
+    state is a mutable dict with keys depth/started/in_string/escape.
+    Returns True once a complete top-level JSON value has been closed.
+    """
+    for ch in chunk:
+        if state["escape"]:
+            state["escape"] = False
+            continue
+        if state["in_string"]:
+            if ch == '\\':
+                state["escape"] = True
+            elif ch == '"':
+                state["in_string"] = False
+            continue
+        if ch == '"':
+            state["in_string"] = True
+        elif ch in '{[':
+            state["depth"] += 1
+            state["started"] = True
+        elif ch in '}]':
+            state["depth"] -= 1
+            if state["started"] and state["depth"] <= 0:
+                return True
+    return False
+
+
+def _new_scan_state():
+    """Fresh state for _scan_for_balanced_json."""
+    return {"depth": 0, "started": False, "in_string": False, "escape": False}
+
+
+def collect_streamed_json(text_chunks):
+    """
+    Accumulate text chunks from a streaming response, stopping as soon as a
+    complete top-level JSON value has been seen.
+
+    All pipeline stages expect exactly one JSON object, so once the closing
+    brace arrives there is no reason to wait for (or pay the latency of)
+    any trailing prose the model might generate. Exiting early lets the
+    caller close the stream and cancel the rest of the generation.
+
+    Args:
+        text_chunks: Iterable of text deltas (e.g. stream.text_stream)
+
+    Returns:
+        str: The accumulated text up to and including the balanced JSON
+    """
+    buffer = []
+    state = _new_scan_state()
+
+    for chunk in text_chunks:
+        buffer.append(chunk)
+        if _scan_for_balanced_json(state, chunk):
+            break
+
+    return ''.join(buffer)
+
+
+async def acollect_streamed_json(text_chunks):
+    """
+    Async version of collect_streamed_json for AsyncAnthropic streams.
+    """
+    buffer = []
+    state = _new_scan_state()
+
+    async for chunk in text_chunks:
+        buffer.append(chunk)
+        if _scan_for_balanced_json(state, chunk):
+            break
+
+    return ''.join(buffer)
+
 
 def extract_json_from_response(response_text, context="API response"):
     """
@@ -25,28 +183,44 @@ def extract_json_from_response(response_text, context="API response"):
         ValueError: If no valid JSON can be extracted
     """
     
-    if not response_text or not response_text.strip():
+    if not response_text:
         raise ValueError(f"Empty response received for {context}")
     
     original_text = response_text
-    cleaned_text = response_text.strip()
+    # Structured-output and well-behaved responses already start with the
+    # JSON itself - skip the strip() copy for those and only clean up when
+    # the text doesn't open with { or [
+    if response_text[0] in '{[':
+        cleaned_text = response_text
+    else:
+        cleaned_text = response_text.strip()
+        if not cleaned_text:
+            raise ValueError(f"Empty response received for {context}")
     
-    # Strategy 1: Try parsing as-is
+    # Strategy 1: Try parsing as-is (the common case - take the fast path)
     try:
-        return json.loads(cleaned_text)
+        return _loads(cleaned_text)
     except json.JSONDecodeError:
         pass
     
+    # Strategy 1b: JSON up front, commentary after. raw_decode parses one
+    # value and stops at its end, so trailing prose costs nothing extra.
+    if cleaned_text[0] in '{[':
+        try:
+            return _DECODER.raw_decode(cleaned_text)[0]
+        except json.JSONDecodeError:
+            pass
+    
     # Strategy 2: Remove markdown code fences (```json ... ```)
-    if "```" in cleaned_text:
+    # A single-character probe is enough to rule fences out cheaply
+    if cleaned_text.find('`') != -1:
         # Find content between ``` markers
-        pattern = r'```(?:json)?\s*\n(.*?)\n```'
-        matches = re.findall(pattern, cleaned_text, re.DOTALL)
+        matches = _FENCE_RE.findall(cleaned_text)
         
         if matches:
             # Try parsing the first match
             try:
-                return json.loads(matches[0])
+                return _loads(matches[0])
             except json.JSONDecodeError:
                 pass
         
@@ -54,12 +228,14 @@ def extract_json_from_response(response_text, context="API response"):
         lines = cleaned_text.split('\n')
         cleaned_lines = [line for line in lines if not line.strip().startswith('```')]
         try:
-            return json.loads('\n'.join(cleaned_lines))
+            return _loads('\n'.join(cleaned_lines))
         except json.JSONDecodeError:
             pass
     
-    # Strategy 3: Look for JSON object/array markers and extract
-    # Find the first { or [ and last } or ]
+    # Strategy 3: Find the first { or [ and parse one value straight from
+    # that position. raw_decode both locates the matching closer and
+    # builds the object in a single pass - no separate balance scan, no
+    # slice, and trailing commentary (even with braces in it) is ignored.
     first_brace = cleaned_text.find('{')
     first_bracket = cleaned_text.find('[')
     
@@ -71,34 +247,67 @@ def extract_json_from_response(response_text, context="API response"):
     
     if first_brace == -1:
         start = first_bracket
-        end_char = ']'
     elif first_bracket == -1:
         start = first_brace
-        end_char = '}'
     else:
         start = min(first_brace, first_bracket)
-        end_char = '}' if start == first_brace else ']'
-    
-    # Find the matching closing brace/bracket
-    end = cleaned_text.rfind(end_char)
-    
-    if end == -1 or end < start:
-        raise ValueError(
-            f"Malformed JSON in {context}. Response: {original_text[:200]}..."
-        )
-    
-    json_str = cleaned_text[start:end+1]
     
     try:
-        return json.loads(json_str)
+        return _DECODER.raw_decode(cleaned_text, start)[0]
     except json.JSONDecodeError as e:
         raise ValueError(
             f"Failed to parse JSON from {context}. "
-            f"Extracted: {json_str[:100]}... "
+            f"Extracted: {cleaned_text[start:start+100]}... "
             f"Error: {e}"
         )
 
 
+def extract_json_fields(response_text, fields, context="API response"):
+    """
+    Extract only the named top-level fields from a JSON response.
+
+    Callers often consume just a couple of keys (e.g. classification uses
+    content_type and confidence) while the response carries more. With
+    ijson installed, the document is parsed lazily key by key and parsing
+    stops as soon as every requested field has been seen - O(prefix)
+    instead of O(document). Without ijson, this falls back to a full
+    extract_json_from_response parse and subsets the result, so behavior
+    is identical either way.
+
+    Args:
+        response_text: The raw text response from the API
+        fields: List of top-level key names to pull out
+        context: Description of what this is for (used in error messages)
+
+    Returns:
+        dict: The requested fields that were present in the response
+
+    Raises:
+        ValueError: If no valid JSON can be extracted
+    """
+    if ijson is not None:
+        cleaned_text = response_text.strip() if response_text else ""
+        if cleaned_text.startswith('{'):
+            wanted = set(fields)
+            found = {}
+            try:
+                for key, value in ijson.kvitems(io.StringIO(cleaned_text), ''):
+                    if key in wanted:
+                        found[key] = value
+                        if len(found) == len(wanted):
+                            return found
+                return found
+            except ijson.JSONError:
+                # Fenced/prefixed responses land here; fall through to the
+                # salvage parser below
+                pass
+
+    result = extract_json_from_response(response_text, context=context)
+    if not isinstance(result, dict):
+        raise ValueError(f"Expected JSON object for {context}, got {type(result).__name__}")
+    return {key: result[key] for key in fields if key in result}
+
+
 def validate_dict_keys(data, required_keys, context="data"):
     """
     Validate that a dictionary contains required keys.